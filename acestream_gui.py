@@ -2,8 +2,9 @@
 import customtkinter as ctk
 import subprocess
 import re
+import sys
+import threading
 from pathlib import Path
-from functools import partial
 from dataclasses import dataclass
 from typing import List, Tuple
 
@@ -11,64 +12,67 @@ from typing import List, Tuple
 @dataclass(frozen=True, slots=True)
 class Channel:
     """Immutable channel data structure for memory efficiency"""
-    index: int
+    # Fields read by filtering and rendering come first
     name: str
     country: str
     categories: str
+    display_text: str
+    search_key: str
+    index: int
+    url: str
     timestamp: str
     score_a: float
     score_b: int
-    url: str
-    
-    @property
-    def display_text(self) -> str:
-        return f"{self.index}. {self.name} [{self.country}] • Score: {self.score_a:.3f}"
+
+
+@dataclass(slots=True)
+class CardWidgets:
+    """Pooled widgets backing one visible row of the channel list"""
+    frame: ctk.CTkFrame
+    button: ctk.CTkButton
+    window_id: int
+    row: int = -1
 
 
 class M3UParser:
     """High-performance M3U playlist parser with functional approach"""
     
-    __slots__ = ('_pattern_extinf', '_pattern_url')
+    __slots__ = ()
     
-    def __init__(self):
-        self._pattern_extinf = re.compile(
-            r'#EXTINF:-1,(\d+)\.\s+(.+?)\s+\[(\w+)\]\s+\[\s*(.+?)\s*\]\s+'
-            r'(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})\s+a=([\d.]+)\s+b=(\d+)'
-        )
-        self._pattern_url = re.compile(r'http://[^\s]+')
+    _EXTINF_PATTERN = re.compile(
+        r'#EXTINF:-1,(\d+)\.\s+([^\[\r\n]+?)\s+\[(\w+)\]\s+\[\s*([^\]\r\n]+?)\s*\]\s+'
+        r'(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})\s+a=([\d.]+)\s+b=(\d+)\r?\n(http://\S+)',
+        re.MULTILINE
+    )
     
     def parse(self, content: str) -> List[Channel]:
-        """Parse M3U content into Channel objects using functional approach"""
-        lines = content.strip().split('\n')
-        pairs = zip(
-            filter(lambda l: l.startswith('#EXTINF'), lines),
-            filter(lambda l: l.startswith('http://'), lines)
-        )
-        
-        return list(filter(None, map(self._create_channel, pairs)))
+        """Parse M3U content into Channel objects in a single regex pass"""
+        return [self._create_channel(m) for m in self._EXTINF_PATTERN.finditer(content)]
     
-    def _create_channel(self, pair: Tuple[str, str]) -> Channel | None:
-        """Create Channel from EXTINF and URL pair"""
-        extinf, url = pair
-        match = self._pattern_extinf.search(extinf)
-        return match and Channel(
-            index=int(match.group(1)),
-            name=match.group(2),
-            country=match.group(3),
-            categories=match.group(4),
-            timestamp=match.group(5),
-            score_a=float(match.group(6)),
-            score_b=int(match.group(7)),
-            url=url.strip()
+    @staticmethod
+    def _create_channel(match: re.Match) -> Channel:
+        """Build Channel with its display and search strings from one EXTINF match"""
+        index, name, country, categories, timestamp, score_a, score_b, url = match.groups()
+        index, score_a = int(index), float(score_a)
+        return Channel(
+            name, country, categories,
+            f"{index}. {name} [{country}] • Score: {score_a:.3f}\n📂 {categories}",
+            f"{name}\t{country}\t{categories}".lower(),
+            index, url, timestamp, score_a, int(score_b)
         )
 
 
 class ModernPlaylistGUI(ctk.CTk):
     """Modern AceStream playlist viewer with professional styling"""
     
-    __slots__ = ('parser', 'channels', 'search_var', 
-                 'scrollable_frame', 'status_label', 'mpv_path', 'header_label',
-                 'playlist_path')
+    ROW_HEIGHT = 80
+    
+    __slots__ = ('parser', 'channels', 'search_entry', 
+                 'canvas', 'scrollbar', 'status_label', 'mpv_path', 'header_label',
+                 'playlist_path', '_filter_after_id', '_card_pool', '_current_view',
+                 '_row_height', '_search_keys', '_last_query', '_last_matches',
+                 '_font_header', '_font_entry', '_font_button', '_font_status', '_updating',
+                 '_load_count')
     
     def __init__(self):
         super().__init__()
@@ -76,18 +80,35 @@ class ModernPlaylistGUI(ctk.CTk):
         # Configuration
         self.parser = M3UParser()
         self.channels: List[Channel] = []
+        self._search_keys: List[str] = []
+        self._last_query = ""
+        self._last_matches: List[int] = []
         self.mpv_path = Path('./mpv.exe')
         self.playlist_path = Path('playlist.m3u')
+        self._filter_after_id = None
+        self._updating = False
+        # Bumped on every load so results of superseded parses are dropped
+        self._load_count = 0
+        self._card_pool: List[CardWidgets] = []
+        self._current_view: List[Channel] = []
         
         # Theme setup
         ctk.set_appearance_mode("dark")
         ctk.set_default_color_theme("blue")
+        # CTkButton has no justify option; left-align multi-line labels of cards on the list canvas
+        self.option_add("*Canvas*Label.justify", "left")
+        
+        # Shared fonts, reused by every widget instead of one Tcl font each
+        self._font_header = ctk.CTkFont(size=28, weight="bold")
+        self._font_entry = ctk.CTkFont(size=14)
+        self._font_button = ctk.CTkFont(size=14, weight="bold")
+        self._font_status = ctk.CTkFont(size=12, weight="bold")
         
         # Window setup
         self.title("AceStream Playlist Viewer")
         self.geometry("900x700")
         self._setup_ui()
-        self._load_playlist()
+        self.after(0, self._load_playlist)
     
     def _setup_ui(self):
         """Build UI components with modern styling"""
@@ -98,7 +119,7 @@ class ModernPlaylistGUI(ctk.CTk):
         self.header_label = ctk.CTkLabel(
             header,
             text="🎬 AceStream Channels",
-            font=ctk.CTkFont(size=28, weight="bold"),
+            font=self._font_header,
             text_color=("#00d9ff", "#4cc9f0")
         )
         self.header_label.pack(pady=15)
@@ -108,20 +129,17 @@ class ModernPlaylistGUI(ctk.CTk):
         control_frame.pack(fill="x", padx=20, pady=(0, 10))
         
         # Search bar
-        self.search_var = ctk.StringVar()
-        self.search_var.trace_add("write", lambda *_: self._filter_channels())
-        
-        search_entry = ctk.CTkEntry(
+        self.search_entry = ctk.CTkEntry(
             control_frame,
             placeholder_text="🔍 Search channels by name, country or category...",
-            textvariable=self.search_var,
             height=45,
-            font=ctk.CTkFont(size=14),
+            font=self._font_entry,
             corner_radius=12,
             border_width=2,
             border_color=("#00b4d8", "#0077b6")
         )
-        search_entry.pack(fill="x", side="left", expand=True, padx=(0, 10))
+        self.search_entry.pack(fill="x", side="left", expand=True, padx=(0, 10))
+        self.search_entry.bind("<KeyRelease>", lambda _: self._schedule_filter())
         
         # Buttons frame
         buttons_frame = ctk.CTkFrame(control_frame, fg_color="transparent")
@@ -134,7 +152,7 @@ class ModernPlaylistGUI(ctk.CTk):
             command=self._update_playlist,
             width=100,
             height=45,
-            font=ctk.CTkFont(size=14, weight="bold"),
+            font=self._font_button,
             fg_color=("#e63946", "#d62828"),
             hover_color=("#c1121f", "#9d0208"),
             corner_radius=12
@@ -147,21 +165,39 @@ class ModernPlaylistGUI(ctk.CTk):
             command=self._load_playlist,
             width=100,
             height=45,
-            font=ctk.CTkFont(size=14, weight="bold"),
+            font=self._font_button,
             fg_color=("#00b4d8", "#0077b6"),
             hover_color=("#0096c7", "#005f8c"),
             corner_radius=12
         ).pack(side="left")
         
-        # Scrollable channel list
-        self.scrollable_frame = ctk.CTkScrollableFrame(
+        # Virtualized channel list: a small pool of cards is re-bound on scroll
+        list_frame = ctk.CTkFrame(
             self,
             fg_color=("#1a1a1a", "#0a0a0a"),
             corner_radius=15,
             border_width=2,
             border_color=("#2b2b2b", "#1a1a1a")
         )
-        self.scrollable_frame.pack(fill="both", expand=True, padx=20, pady=(0, 10))
+        list_frame.pack(fill="both", expand=True, padx=20, pady=(0, 10))
+        
+        self._row_height = round(self.ROW_HEIGHT * ctk.ScalingTracker.get_widget_scaling(self))
+        self.scrollbar = ctk.CTkScrollbar(list_frame)
+        self.scrollbar.pack(side="right", fill="y", padx=(0, 6), pady=8)
+        
+        self.canvas = ctk.CTkCanvas(
+            list_frame,
+            bg="#0a0a0a",
+            highlightthickness=0,
+            yscrollincrement=self._row_height,
+            yscrollcommand=self._on_canvas_scroll
+        )
+        self.canvas.pack(side="left", fill="both", expand=True, padx=(8, 0), pady=8)
+        self.scrollbar.configure(command=self.canvas.yview)
+        self.canvas.bind("<Configure>", self._on_canvas_configure)
+        self.bind_all("<MouseWheel>", self._on_mouse_wheel, add="+")
+        self.bind_all("<Button-4>", self._on_mouse_wheel, add="+")
+        self.bind_all("<Button-5>", self._on_mouse_wheel, add="+")
         
         # Status bar
         status_frame = ctk.CTkFrame(self, fg_color=("#1e3a5f", "#0d1b2a"), height=40, corner_radius=12)
@@ -171,16 +207,22 @@ class ModernPlaylistGUI(ctk.CTk):
         self.status_label = ctk.CTkLabel(
             status_frame,
             text="Ready",
-            font=ctk.CTkFont(size=12, weight="bold"),
+            font=self._font_status,
             text_color=("#4cc9f0", "#00d9ff")
         )
         self.status_label.pack(pady=8)
     
     def _update_playlist(self):
-        """Run BAT file to update playlist"""
+        """Run BAT file in the background to update playlist"""
+        # One run at a time: each run truncates and rewrites playlist.m3u
+        if self._updating:
+            return
+        self._updating = True
         self.status_label.configure(text="⚡ Updating playlist from AceStream...")
-        self.update()
-        
+        threading.Thread(target=self._run_update_bg, daemon=True).start()
+    
+    def _run_update_bg(self):
+        """Worker thread: run BAT file and marshal the outcome to the Tk thread"""
         try:
             # Run batch file
             result = subprocess.run(
@@ -191,111 +233,152 @@ class ModernPlaylistGUI(ctk.CTk):
                 cwd='.',
                 shell=True
             )
+            self.after(0, self._on_update_done, result.returncode)
             
-            if result.returncode == 0:
-                self.status_label.configure(
-                    text="✓ Playlist updated successfully",
-                    text_color=("#4cc9f0", "#00d9ff")
-                )
-                # Auto-load after update
-                self.after(500, self._load_playlist)
-            else:
-                self.status_label.configure(
-                    text=f"⚠ Update warning: check save_playlist.bat",
-                    text_color=("#ffc107", "#ff9800")
-                )
-                
         except subprocess.TimeoutExpired:
-            self.status_label.configure(
-                text="⚠ Update timeout (>60s)",
-                text_color=("#ff6b6b", "#ff5252")
-            )
+            self.after(0, self._on_update_failed, "⚠ Update timeout (>60s)")
         except FileNotFoundError:
-            self.status_label.configure(
-                text="✗ save_playlist.bat not found",
-                text_color=("#ff6b6b", "#ff5252")
-            )
+            self.after(0, self._on_update_failed, "✗ save_playlist.bat not found")
         except Exception as e:
-            self.status_label.configure(
-                text=f"✗ Update error: {str(e)[:40]}",
-                text_color=("#ff6b6b", "#ff5252")
-            )
+            self.after(0, self._on_update_failed, f"✗ Update error: {str(e)[:40]}")
+    
+    def _on_update_done(self, returncode: int):
+        """Report BAT file result and reload the playlist on success"""
+        self._updating = False
+        if returncode == 0:
+            self._set_status("✓ Playlist updated successfully", ("#4cc9f0", "#00d9ff"))
+            # Auto-load after update
+            self._load_playlist()
+        else:
+            self._set_status("⚠ Update warning: check save_playlist.bat", ("#ffc107", "#ff9800"))
+    
+    def _on_update_failed(self, text: str):
+        """Report an update that could not run and accept new updates again"""
+        self._updating = False
+        self._set_status(text, ("#ff6b6b", "#ff5252"))
+    
+    def _set_status(self, text: str, text_color: Tuple[str, str]):
+        """Update status bar text and color"""
+        self.status_label.configure(text=text, text_color=text_color)
     
     def _load_playlist(self):
-        """Load and parse playlist from M3U file"""
+        """Load and parse playlist from M3U file in the background"""
+        # The file is being rewritten; _on_update_done reloads it when the update ends
+        if self._updating:
+            return
+        self._load_count += 1
         self.status_label.configure(text="⏳ Loading playlist from file...")
-        self.update()
-        
+        threading.Thread(target=self._parse_bg, args=(self._load_count,), daemon=True).start()
+    
+    def _parse_bg(self, load_count: int):
+        """Worker thread: read, decode and parse playlist, then hand off to Tk"""
         try:
-            # Read M3U file
-            if not self.playlist_path.exists():
-                self.status_label.configure(
-                    text="⚠ playlist.m3u not found. Click 'Update' first.",
-                    text_color=("#ffc107", "#ff9800")
-                )
-                return
-            
-            content = self.playlist_path.read_text(encoding='utf-8')
-            self.channels = self.parser.parse(content)
-            self._display_channels(self.channels)
-            
-            self.status_label.configure(
-                text=f"✓ Loaded {len(self.channels)} channels from {self.playlist_path.name}",
-                text_color=("#4cc9f0", "#00d9ff")
-            )
-            self.header_label.configure(
-                text=f"🎬 AceStream Channels ({len(self.channels)})"
-            )
-            
-        except UnicodeDecodeError:
+            raw = self.playlist_path.read_bytes()
+            encoding = 'utf-8-sig' if raw[:3] == b'\xef\xbb\xbf' else 'utf-8'
             try:
+                content = raw.decode(encoding)
+            except UnicodeDecodeError:
                 # Try with cp1251 if UTF-8 fails
-                content = self.playlist_path.read_text(encoding='cp1251')
-                self.channels = self.parser.parse(content)
-                self._display_channels(self.channels)
-                self.status_label.configure(
-                    text=f"✓ Loaded {len(self.channels)} channels (cp1251)",
-                    text_color=("#4cc9f0", "#00d9ff")
-                )
-            except Exception as e:
-                self.status_label.configure(
-                    text=f"✗ Encoding error: {str(e)[:40]}",
-                    text_color=("#ff6b6b", "#ff5252")
-                )
+                encoding = 'cp1251'
+                content = raw.decode(encoding)
+            
+            channels = self.parser.parse(content)
+            search_keys = [ch.search_key for ch in channels]
+            self.after(0, self._on_parsed, load_count, channels, search_keys, encoding)
+            
+        except FileNotFoundError:
+            self.after(0, self._on_load_failed, load_count, "⚠ playlist.m3u not found. Click 'Update' first.", ("#ffc107", "#ff9800"))
+        except UnicodeDecodeError as e:
+            self.after(0, self._on_load_failed, load_count, f"✗ Encoding error: {str(e)[:40]}", ("#ff6b6b", "#ff5252"))
         except Exception as e:
-            self.status_label.configure(
-                text=f"✗ Load error: {str(e)[:50]}",
-                text_color=("#ff6b6b", "#ff5252")
-            )
+            self.after(0, self._on_load_failed, load_count, f"✗ Load error: {str(e)[:50]}", ("#ff6b6b", "#ff5252"))
+    
+    def _on_load_failed(self, load_count: int, text: str, text_color: Tuple[str, str]):
+        """Report a failed load unless a newer load has started since"""
+        if load_count == self._load_count:
+            self._set_status(text, text_color)
+    
+    def _on_parsed(self, load_count: int, channels: List[Channel], search_keys: List[str], encoding: str):
+        """Install freshly parsed channels and refresh the view"""
+        if load_count != self._load_count:
+            return
+        self.channels = channels
+        self._search_keys = search_keys
+        self._last_query, self._last_matches = "", []
+        self.header_label.configure(
+            text=f"🎬 AceStream Channels ({len(channels)})"
+        )
+        
+        # A query typed while the file was loading applies to the new channels
+        if self.search_entry.get():
+            self._filter_channels()
+            return
+        
+        self._display_channels(channels)
+        suffix = " (cp1251)" if encoding == 'cp1251' else ""
+        self._set_status(
+            f"✓ Loaded {len(channels)} channels from {self.playlist_path.name}{suffix}",
+            ("#4cc9f0", "#00d9ff")
+        )
     
     def _display_channels(self, channels: List[Channel]):
-        """Display channels with modern card-style buttons"""
-        # Clear existing widgets safely
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
+        """Show channels in the virtualized list, binding only visible cards"""
+        self._current_view = channels
+        for card in self._card_pool:
+            card.row = -1
+        self.canvas.itemconfigure("card", state="hidden")
+        
+        self.canvas.configure(scrollregion=(0, 0, 0, len(channels) * self._row_height))
+        self.canvas.yview_moveto(0)
+        self._render_visible()
+    
+    def _render_visible(self):
+        """Re-bind pooled cards to the rows currently inside the viewport"""
+        visible_rows = self.canvas.winfo_height() // self._row_height + 1
+        while len(self._card_pool) < visible_rows + 4:
+            self._card_pool.append(self._create_card())
+        
+        view, pool = self._current_view, self._card_pool
+        first = int(self.canvas.yview()[0] * len(view))
+        last = min(first + len(pool), len(view))
         
-        # Create channel cards
-        tuple(map(self._create_channel_card, channels))
+        for i in range(first, last):
+            card = pool[i % len(pool)]
+            if card.row == i:
+                continue
+            channel = view[i]
+            card.row = i
+            card.button.configure(text=channel.display_text)
+            self.canvas.coords(card.window_id, 5, i * self._row_height)
+            self.canvas.itemconfigure(card.window_id, state="normal")
+        
+        # Hide pooled cards that fall past the end of the view
+        for i in range(last, first + len(pool)):
+            card = pool[i % len(pool)]
+            if card.row != -1:
+                card.row = -1
+                self.canvas.itemconfigure(card.window_id, state="hidden")
     
-    def _create_channel_card(self, channel: Channel):
-        """Create styled card for a channel"""
+    def _create_card(self) -> CardWidgets:
+        """Create an empty pooled card; content is bound by _render_visible"""
+        slot = len(self._card_pool)
+        
         # Card container
         card = ctk.CTkFrame(
-            self.scrollable_frame,
+            self.canvas,
             fg_color=("#2b2b2b", "#1a1a1a"),
             corner_radius=12,
             border_width=2,
             border_color=("#404040", "#2a2a2a")
         )
-        card.pack(fill="x", pady=5, padx=5)
         
         # Main button
         button = ctk.CTkButton(
             card,
-            text=channel.display_text,
-            command=partial(self._play_channel, channel),
+            text="",
+            command=lambda: self._play_channel_by_index(self._card_pool[slot].row),
             height=55,
-            font=ctk.CTkFont(size=14, weight="bold"),
+            font=self._font_button,
             fg_color=("transparent", "transparent"),
             hover_color=("#00b4d8", "#0077b6"),
             corner_radius=10,
@@ -304,29 +387,63 @@ class ModernPlaylistGUI(ctk.CTk):
         )
         button.pack(fill="both", expand=True, padx=5, pady=5)
         
-        # Category badge
-        badge = ctk.CTkLabel(
-            button,
-            text=f"📂 {channel.categories}",
-            font=ctk.CTkFont(size=11),
-            text_color=("#00d9ff", "#4cc9f0"),
-            fg_color=("#1a1a1a", "#0a0a0a"),
-            corner_radius=8,
-            padx=10,
-            pady=3
+        window_id = self.canvas.create_window(
+            5, 0,
+            window=card,
+            anchor="nw",
+            width=max(self.canvas.winfo_width() - 10, 1),
+            height=self._row_height - 10,
+            state="hidden",
+            tags="card"
         )
-        badge.place(relx=0.98, rely=0.5, anchor="e")
+        return CardWidgets(card, button, window_id)
+    
+    def _on_canvas_scroll(self, first: str, last: str):
+        """Sync scrollbar with the canvas and re-bind cards for the new viewport"""
+        self.scrollbar.set(first, last)
+        self._render_visible()
+    
+    def _on_canvas_configure(self, event):
+        """Stretch pooled cards to the canvas width and fill newly exposed rows"""
+        self.canvas.itemconfigure("card", width=max(event.width - 10, 1))
+        self._render_visible()
+    
+    def _on_mouse_wheel(self, event):
+        """Scroll the channel list when the wheel is used over it"""
+        widget, canvas = str(event.widget), str(self.canvas)
+        if widget != canvas and not widget.startswith(canvas + "."):
+            return
+        if event.num in (4, 5):
+            step = -3 if event.num == 4 else 3
+        elif sys.platform.startswith("win"):
+            step = -int(event.delta / 40)
+        else:
+            step = -event.delta
+        self.canvas.yview_scroll(step, "units")
+    
+    def _schedule_filter(self):
+        """Debounce search input so only the last keystroke in a burst filters"""
+        if self._filter_after_id:
+            self.after_cancel(self._filter_after_id)
+        self._filter_after_id = self.after(150, self._filter_channels)
     
     def _filter_channels(self):
         """Filter channels based on search query"""
-        query = self.search_var.get().lower()
-        filtered = list(filter(
-            lambda ch: any(map(
-                lambda field: query in str(field).lower(),
-                (ch.name, ch.country, ch.categories)
-            )),
-            self.channels
-        )) if query else self.channels
+        query = self.search_entry.get().lower()
+        if query == self._last_query:
+            return
+        channels, keys = self.channels, self._search_keys
+        
+        if not query:
+            matches = []
+        elif self._last_query and query.startswith(self._last_query):
+            # Extending the previous query can only narrow its matches
+            matches = [i for i in self._last_matches if query in keys[i]]
+        else:
+            matches = [i for i, key in enumerate(keys) if query in key]
+        
+        self._last_query, self._last_matches = query, matches
+        filtered = [channels[i] for i in matches] if query else channels
         
         self._display_channels(filtered)
         self.status_label.configure(
@@ -334,6 +451,10 @@ class ModernPlaylistGUI(ctk.CTk):
             text_color=("#4cc9f0", "#00d9ff")
         )
     
+    def _play_channel_by_index(self, row: int):
+        """Play the channel at ``row`` of the currently displayed list"""
+        self._play_channel(self._current_view[row])
+    
     def _play_channel(self, channel: Channel):
         """Launch MPV player with selected channel"""
         self.status_label.configure(
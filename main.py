@@ -10,64 +10,53 @@ from typing import Optional, List, Tuple
 import tkinter as tk
 from tkinter import ttk, messagebox
 import subprocess
+import asyncio
 import re
-from dataclasses import dataclass
-from functools import lru_cache
 import os
 import threading
+from concurrent.futures import ThreadPoolExecutor
 
 
-@dataclass(frozen=True, slots=True)
-class Channel:
-    """Immutable channel data structure for optimal memory usage."""
-    index: int
-    name: str
-    url: str
-    metadata: str
+# Parsed playlist as parallel (struct-of-arrays) lists: names, urls, metadata
+Playlist = Tuple[List[str], List[str], List[str]]
 
 
 class M3UParser:
     """High-performance M3U playlist parser with lazy evaluation."""
     __slots__ = ('_path', '_encoding')
     
-    _EXTINF_PATTERN = re.compile(r'^#EXTINF:-?\d+,(.+)$')
+    # One match per line: name is everything after the first comma, metadata its first [...] group
+    _EXTINF_PATTERN = re.compile(r'#EXTINF:[^,]*,((?:[^\[]*\[([^\]]*)\])?.*)')
     
     def __init__(self, path: Path, encoding: str = 'utf-8'):
         self._path = path
         self._encoding = encoding
     
-    @lru_cache(maxsize=1)
-    def parse(self) -> Tuple[Channel, ...]:
-        """Parse M3U file and return immutable tuple of channels."""
+    def parse(self) -> Playlist:
+        """Parse M3U file in a single streaming pass into parallel name/URL/metadata lists."""
+        names: List[str] = []
+        urls: List[str] = []
+        metas: List[str] = []
+        
+        match = self._EXTINF_PATTERN.match
+        
         with self._path.open('r', encoding=self._encoding, errors='ignore') as f:
-            lines = tuple(line.strip() for line in f if line.strip())
-        return tuple(self._parse_channels(lines))
-    
-    def _parse_channels(self, lines: Tuple[str, ...]) -> List[Channel]:
-        """Parse channel data from lines using generator pattern."""
-        channels = []
-        i, idx = 0, 1
-        
-        while i < len(lines):
-            if lines[i].startswith('#EXTINF'):
-                match = self._EXTINF_PATTERN.match(lines[i])
-                if match and i + 1 < len(lines):
-                    name = match.group(1)
-                    url = lines[i + 1]
-                    metadata = self._extract_metadata(name)
-                    channels.append(Channel(idx, name, url, metadata))
-                    idx += 1
-                    i += 2
+            lines = filter(None, map(str.strip, f))
+            for line in lines:
+                extinf = match(line)
+                if extinf is None:
                     continue
-            i += 1
-        
-        return channels
-    
-    @staticmethod
-    def _extract_metadata(name: str) -> str:
-        """Extract category metadata from channel name."""
-        match = re.search(r'\[(.*?)\]', name)
-        return match.group(1) if match else ''
+                name, meta = extinf.groups('')
+                if not name:
+                    continue
+                url = next(lines, None)
+                if url is None:
+                    break
+                names.append(name)
+                urls.append(url)
+                metas.append(meta)
+        
+        return names, urls, metas
 
 
 class PlaylistDownloader:
@@ -77,13 +66,9 @@ class PlaylistDownloader:
     def __init__(self, playlist_path: Path = Path('playlist.m3u')):
         self._playlist_path = playlist_path
     
-    def download_playlist(self, progress_callback=None) -> Tuple[bool, str]:
+    async def download_playlist(self, progress_callback=None) -> Tuple[bool, str]:
         """Execute acestream_search and save to playlist.m3u with UTF-8 encoding."""
         try:
-            # Clear existing playlist
-            if self._playlist_path.exists():
-                self._playlist_path.unlink()
-            
             # Set UTF-8 environment
             env = os.environ.copy()
             env['PYTHONIOENCODING'] = 'utf-8'
@@ -92,51 +77,51 @@ class PlaylistDownloader:
                 progress_callback(0, 'Starting download...')
             
             # Execute uv run acestream_search
-            process = subprocess.Popen(
-                ['acestream_search'],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                encoding='utf-8',
+            process = await asyncio.create_subprocess_exec(
+                'acestream_search',
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
                 env=env,
                 creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0
             )
             
-            # Collect output with progress tracking
-            output_lines = []
-            stream_count = 0
-            estimated_total = 2100
-            
-            for line in process.stdout:
-                output_lines.append(line)
-                # Count EXTINF lines for progress
-                if line.startswith('#EXTINF'):
-                    stream_count += 1
-                    if progress_callback and stream_count % 50 == 0:
-                        progress = min(95, (stream_count / estimated_total) * 100)
-                        progress_callback(progress, f'Loading streams: {stream_count}/{estimated_total}')
+            if progress_callback:
+                progress_callback(10, 'Downloading streams...')
             
-            process.wait()
+            # Drain stdout and stderr together at pipe speed
+            output, stderr = await process.communicate()
+            stream_count = output.count(b'#EXTINF')
             
             if progress_callback:
                 progress_callback(98, 'Saving playlist...')
             
-            if process.returncode == 0 and output_lines:
-                output = ''.join(output_lines)
-                self._playlist_path.write_text(output, encoding='utf-8')
+            if process.returncode == 0 and output:
+                # Leave an identical playlist untouched so its mtime still marks it unchanged
+                if not self._is_saved(output):
+                    # Write beside the target and swap, so a crash never leaves a half-written playlist
+                    tmp_path = self._playlist_path.with_suffix('.m3u.tmp')
+                    tmp_path.write_bytes(output)
+                    os.replace(tmp_path, self._playlist_path)
                 
                 if progress_callback:
                     progress_callback(100, f'Completed! Loaded {stream_count} streams')
                 
                 return True, f'Playlist saved: {stream_count} streams loaded'
             
-            stderr = process.stderr.read() if process.stderr else ''
-            return False, f'Failed to download playlist: {stderr}'
+            return False, f'Failed to download playlist: {stderr.decode("utf-8", "ignore")}'
             
         except FileNotFoundError:
             return False, 'uv command not found. Please ensure uv is installed.'
         except Exception as e:
             return False, f'Error downloading playlist: {str(e)}'
+    
+    def _is_saved(self, data: bytes) -> bool:
+        """Check whether the playlist on disk already holds exactly these bytes."""
+        try:
+            return (self._playlist_path.stat().st_size == len(data)
+                    and self._playlist_path.read_bytes() == data)
+        except OSError:
+            return False
 
 
 class MPVController:
@@ -252,7 +237,6 @@ class ProgressDialog(tk.Toplevel):
         self._progress_var.set(progress)
         self._status_var.set(status)
         self._percent_label.config(text=f'{int(progress)}%')
-        self.update_idletasks()
     
     def _on_cancel(self):
         """Handle cancel request."""
@@ -277,8 +261,10 @@ class ModernPlaylistPlayer(tk.Tk):
         'refresh_hover': '#1a9870'
     }
     
-    __slots__ = ('_parser', '_mpv', '_channels', '_tree', '_search_var',
-                 '_status_var', '_filter_var', '_style', '_downloader', '_channel_map')
+    __slots__ = ('_parser', '_mpv', '_names', '_urls', '_metas', '_tree', '_search_var',
+                 '_status_var', '_filter_var', '_style', '_downloader', '_channel_map',
+                 '_names_lc', '_urls_lc', '_search_after_id', '_all_item_ids',
+                 '_filter_menu', '_executor', '_last_stat', '_loop', '_load_count')
     
     def __init__(self):
         super().__init__()
@@ -289,8 +275,25 @@ class ModernPlaylistPlayer(tk.Tk):
         self._mpv = MPVController()
         self._downloader = PlaylistDownloader()
         self._parser: Optional[M3UParser] = None
-        self._channels: Tuple[Channel, ...] = ()
-        self._channel_map: dict = {}  # Map tree items to channels
+        # Channel columns as parallel lists
+        self._names: List[str] = []
+        self._urls: List[str] = []
+        self._metas: List[str] = []
+        self._channel_map: dict = {}  # Map tree items to channel indices
+        self._all_item_ids: List[str] = []  # Every inserted row, attached or not
+        # Case-folded search columns, rebuilt on every load
+        self._names_lc: List[str] = []
+        self._urls_lc: List[str] = []
+        self._search_after_id: Optional[str] = None
+        # Single worker keeps filter results in submission order
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        # Persistent event loop thread that runs playlist downloads
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        # (st_mtime_ns, st_size) of the playlist currently shown
+        self._last_stat: Optional[Tuple[int, int]] = None
+        # Bumped on every load so filter results from before it are discarded
+        self._load_count = 0
         
         self._setup_styles()
         self._create_widgets()
@@ -377,7 +380,7 @@ class ModernPlaylistPlayer(tk.Tk):
         ).pack(side='left', padx=(0, 5))
         
         self._search_var = tk.StringVar()
-        self._search_var.trace('w', lambda *_: self._filter_channels())
+        self._search_var.trace('w', lambda *_: self._schedule_filter())
         
         search_entry = tk.Entry(
             search_frame,
@@ -400,8 +403,9 @@ class ModernPlaylistPlayer(tk.Tk):
             width=20
         )
         filter_menu.pack(side='right', padx=5)
-        filter_menu.bind('<<ComboboxSelected>>', lambda _: self._filter_channels())
+        filter_menu.bind('<<ComboboxSelected>>', lambda _: self._schedule_filter())
         filter_menu['values'] = ('All Categories',)
+        self._filter_menu = filter_menu
         
         # Main content area
         content_frame = ttk.Frame(self, style='Modern.TFrame')
@@ -492,30 +496,33 @@ class ModernPlaylistPlayer(tk.Tk):
         """Download playlist from acestream_search with progress dialog."""
         progress_dialog = ProgressDialog(self)
         
-        def download_thread():
+        def download_done(future):
             try:
-                success, message = self._downloader.download_playlist(
-                    progress_callback=lambda p, s: progress_dialog.update_progress(p, s)
-                )
-                
-                self.after(100, lambda: self._on_download_complete(progress_dialog, success, message))
+                success, message = future.result()
             except Exception as e:
-                self.after(100, lambda: self._on_download_complete(progress_dialog, False, str(e)))
-        
-        thread = threading.Thread(target=download_thread, daemon=True)
-        thread.start()
+                success, message = False, str(e)
+            self.after(100, lambda: self._on_download_complete(progress_dialog, success, message))
+        
+        future = asyncio.run_coroutine_threadsafe(
+            self._downloader.download_playlist(
+                # Tk is not thread-safe: post each update to the main loop
+                progress_callback=lambda p, s: self.after(0, progress_dialog.update_progress, p, s)
+            ),
+            self._loop
+        )
+        future.add_done_callback(download_done)
     
     def _on_download_complete(self, dialog: ProgressDialog, success: bool, message: str):
         """Handle download completion."""
         dialog.destroy()
         
         if success:
-            # Clear existing playlist data
-            self._channels = ()
-            self._channel_map.clear()
-            self._tree.delete(*self._tree.get_children())
             self._search_var.set('')
             self._filter_var.set('All Categories')
+            # The reload below shows everything; drop the filter queued by the reset
+            if self._search_after_id:
+                self.after_cancel(self._search_after_id)
+                self._search_after_id = None
             
             # Load new playlist
             self._load_playlist(Path('playlist.m3u'))
@@ -525,61 +532,87 @@ class ModernPlaylistPlayer(tk.Tk):
     
     def _load_playlist(self, path: Path) -> None:
         """Load and parse M3U playlist file."""
+        self._load_count += 1
         try:
+            stat = path.stat()
+            fingerprint = (stat.st_mtime_ns, stat.st_size)
+            if fingerprint == self._last_stat:
+                # Same file as last load: only undo any filtering
+                self._tree.set_children('', *self._all_item_ids)
+                self._status_var.set(f'✓ Playlist unchanged: {len(self._names)} channels from {path.name}')
+                return
+            
             self._parser = M3UParser(path)
-            self._channels = self._parser.parse()
+            self._names, self._urls, self._metas = self._parser.parse()
+            self._build_search_index()
             self._populate_tree()
             self._update_filter_menu()
-            self._status_var.set(f'✓ Loaded {len(self._channels)} channels from {path.name}')
+            self._last_stat = fingerprint
+            self._status_var.set(f'✓ Loaded {len(self._names)} channels from {path.name}')
         except Exception as e:
             messagebox.showerror('Error', f'Failed to load playlist:\n{str(e)}')
             self._status_var.set('Error loading playlist')
     
-    def _populate_tree(self, channels: Optional[Tuple[Channel, ...]] = None) -> None:
-        """Populate treeview with channel data (without URLs) and map to channel objects."""
-        self._tree.delete(*self._tree.get_children())
-        self._channel_map.clear()
-        display_channels = channels if channels is not None else self._channels
-        
-        for channel in display_channels:
-            # Insert channel data without URL display
-            item_id = self._tree.insert(
-                '',
-                'end',
-                values=(channel.name, channel.metadata)
-            )
-            # Map tree item to channel object for URL retrieval
-            self._channel_map[item_id] = channel
+    def _build_search_index(self) -> None:
+        """Precompute case-folded names/URLs for filtering."""
+        self._names_lc = [name.lower() for name in self._names]
+        self._urls_lc = [url.lower() for url in self._urls]
+    
+    def _populate_tree(self) -> None:
+        """Insert every channel row once (without URLs); filtering only re-links them."""
+        # Detached rows are not returned by get_children(), so delete by id
+        self._tree.delete(*self._all_item_ids)
+        self._all_item_ids = [
+            self._tree.insert('', 'end', values=row)
+            for row in zip(self._names, self._metas)
+        ]
+        # Map tree item to channel index for URL retrieval
+        self._channel_map = {item: index for index, item in enumerate(self._all_item_ids)}
     
     def _update_filter_menu(self) -> None:
         """Update category filter dropdown."""
-        categories = {'All Categories'}
-        categories.update(ch.metadata for ch in self._channels if ch.metadata)
-        
-        filter_widget = None
-        for child in self.winfo_children():
-            if isinstance(child, ttk.Frame):
-                for subchild in child.winfo_children():
-                    if isinstance(subchild, ttk.Combobox):
-                        filter_widget = subchild
-                        break
-        
-        if filter_widget:
-            filter_widget['values'] = tuple(sorted(categories))
+        categories = {'All Categories', *filter(None, self._metas)}
+        self._filter_menu['values'] = tuple(sorted(categories))
+    
+    def _schedule_filter(self) -> None:
+        """Debounce filter requests so a burst of keystrokes filters once."""
+        if self._search_after_id:
+            self.after_cancel(self._search_after_id)
+        self._search_after_id = self.after(150, self._filter_channels)
     
     def _filter_channels(self) -> None:
-        """Filter channels based on search and category."""
+        """Filter channels based on search and category on a worker thread."""
         search_text = self._search_var.get().lower()
         category = self._filter_var.get()
+        load_count = self._load_count
         
-        filtered = tuple(
-            ch for ch in self._channels
-            if (search_text in ch.name.lower() or search_text in ch.url.lower())
-            and (category == 'All Categories' or ch.metadata == category)
+        future = self._executor.submit(
+            self._match_items, search_text, category,
+            self._all_item_ids, self._names_lc, self._urls_lc, self._metas
+        )
+        future.add_done_callback(
+            lambda f: self.after(0, self._apply_filter_result, load_count, f.result())
         )
+    
+    @staticmethod
+    def _match_items(search_text: str, category: str, item_ids: List[str],
+                     names: List[str], urls: List[str], cats: List[str]) -> List[str]:
+        """Return tree item ids whose channel matches search text and category."""
+        any_category = category == 'All Categories'
+        return [
+            item for item, name, url, cat in zip(item_ids, names, urls, cats)
+            if (search_text in name or search_text in url)
+            and (any_category or cat == category)
+        ]
+    
+    def _apply_filter_result(self, load_count: int, visible: List[str]) -> None:
+        """Show filter matches on the Tk thread unless the playlist was reloaded meanwhile."""
+        if load_count != self._load_count:
+            return
         
-        self._populate_tree(filtered)
-        self._status_var.set(f'Showing {len(filtered)} of {len(self._channels)} channels')
+        # One Tcl call: reattach matches in playlist order, detach the rest
+        self._tree.set_children('', *visible)
+        self._status_var.set(f'Showing {len(visible)} of {len(self._names)} channels')
     
     def _play_selected(self) -> None:
         """Play selected channel in MPV using channel map."""
@@ -590,14 +623,15 @@ class ModernPlaylistPlayer(tk.Tk):
             return
         
         item_id = selection[0]
-        channel = self._channel_map.get(item_id)
+        index = self._channel_map.get(item_id)
         
-        if not channel:
+        if index is None:
             messagebox.showerror('Error', 'Invalid channel selection')
             return
         
-        if self._mpv.play(channel.url, channel.name):
-            self._status_var.set(f'▶ Playing: {channel.name}')
+        name = self._names[index]
+        if self._mpv.play(self._urls[index], name):
+            self._status_var.set(f'▶ Playing: {name}')
         else:
             messagebox.showerror('Error', 'MPV player not found.\nPlease ensure mpv.exe is in the project folder')
             self._status_var.set('Playback failed')
@@ -610,6 +644,8 @@ class ModernPlaylistPlayer(tk.Tk):
     def _on_closing(self) -> None:
         """Clean up resources on window close."""
         self._mpv.stop()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._loop.call_soon_threadsafe(self._loop.stop)
         self.destroy()
 
 